@@ -4,23 +4,174 @@ SLUSD Website Crawler - Find pages and PDFs containing "835 E. 14th St"
 Crawls www.slusd.us to identify content that needs address updates
 """
 
+import asyncio
+import atexit
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+import lxml.html
+from urllib.parse import urljoin, urlsplit, urlunsplit
 import csv
-import time
+import functools
+import hashlib
+import multiprocessing
 import re
-from collections import deque
-import PyPDF2
+import sqlite3
+import threading
+import time
+import urllib.robotparser
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+import pypdfium2 as pdfium
 import io
 import os
 from datetime import datetime
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None  # Optional - address checks fall back to the fused regex alone
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None  # Optional - link extraction falls back to lxml
+
+try:
+    import brotli  # noqa: F401 - lets requests and aiohttp decode br responses
+    ACCEPT_ENCODING = 'gzip, br, deflate'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+try:
+    import xxhash
+    
+    def url_hash(url):
+        """Return a 64-bit hash of a URL - dedup sets hold these instead of full strings"""
+        return xxhash.xxh64_intdigest(url.encode())
+except ImportError:
+    def url_hash(url):
+        """Return a 64-bit hash of a URL - dedup sets hold these instead of full strings"""
+        return int.from_bytes(hashlib.blake2b(url.encode(), digest_size=8).digest(), 'little')
+
+@functools.lru_cache(maxsize=65536)
+def split_url(url):
+    """Cached urlsplit - the same navigation and footer links turn up on nearly every page"""
+    return urlsplit(url)
+
+
+def is_tracking_param(key):
+    """Whether a query parameter only tracks the visitor and never changes the page"""
+    return key.startswith('utm_') or key == 'fbclid'
+
+
+@functools.lru_cache(maxsize=65536)
+def canonicalize_url(url):
+    """Normalize a URL so near-duplicates (case, ports, tracking params, param order) collapse"""
+    parsed = split_url(url)
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    
+    # Strip default ports
+    default_port = {'http': ':80', 'https': ':443'}.get(scheme)
+    if default_port and netloc.endswith(default_port):
+        netloc = netloc[:-len(default_port)]
+    
+    # Drop tracking parameters and sort the rest, each kept exactly as written (no re-encoding)
+    query = sorted(param for param in parsed.query.split('&')
+                   if param and not is_tracking_param(param.split('=', 1)[0]))
+    
+    # Fragment dropped - it never changes the page the server returns. The path (including
+    # any trailing slash) is kept, since servers redirect between the two forms
+    return urlunsplit((scheme, netloc, parsed.path or '/', '&'.join(query), ''))
+
+FIELDNAMES = ['URL', 'Type', 'Title', 'Address Found', 'Notes', 'Parent Page', 'Timestamp']
+
+
+@functools.lru_cache(maxsize=None)
+def compile_address_patterns(patterns):
+    """Fuse address patterns into one alternation so text is traversed once instead of once per pattern"""
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
+def _extract_pdf_text(pdf_bytes, patterns, quick_check):
+    """Scan a PDF page by page for the address patterns - runs in a worker process"""
+    combined_pattern = compile_address_patterns(tuple(patterns))
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    try:
+        # Scan each page as it is extracted and return immediately on first match
+        for page in pdf:
+            try:
+                textpage = page.get_textpage()
+                page_text = textpage.get_text_range()
+                
+                # Release PDFium page resources now rather than holding every page until the end
+                textpage.close()
+                page.close()
+                
+                if quick_check not in page_text:
+                    continue
+                match = combined_pattern.search(page_text)
+                if match:
+                    return True, match.group()  # Later pages are never extracted
+            except Exception:
+                continue  # Skip pages that can't be read
+        
+        return False, None  # No matches found in any page
+    finally:
+        pdf.close()
+
+
+def _pdf_worker_loop(conn):
+    """Extract each PDF sent over the pipe until it is closed - runs in a worker process"""
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send(_extract_pdf_text(*job))
+        except Exception as e:
+            conn.send(RuntimeError(str(e)))  # A bad document, not a broken worker
+
+
+class PdfWorker:
+    """A long-lived PDF extraction process that can be killed if a document hangs it"""
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        # Daemonic, so a stuck worker never holds up interpreter exit
+        self.process = context.Process(target=_pdf_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def extract(self, pdf_bytes, patterns, quick_check, timeout):
+        """Extract one PDF, timing only the extraction itself"""
+        self.conn.send((pdf_bytes, patterns, quick_check))
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"PDF extraction took over {timeout}s")
+        result = self.conn.recv()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def kill(self):
+        """Stop the process even if it is stuck inside PDFium"""
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
 class SLUSDCrawler:
     def __init__(self, base_url="https://www.slusd.us"):
-        self.base_url = base_url
-        self.domain = urlparse(base_url).netloc
+        self.base_url = canonicalize_url(base_url)
+        self.domain = split_url(self.base_url).netloc
+        # Dedup sets hold url_hash() values; collisions are negligible at this crawl size
         self.visited_urls = set()
+        self.queued_urls = set()  # Mirrors the queue contents for O(1) membership checks
+        self.visited_pdfs = set()  # PDFs already checked this run, however many pages link them
         self.found_pages = []
         self.found_pdfs = []
         
@@ -35,8 +186,12 @@ class SLUSDCrawler:
             r'835\s*E\s*14(?!\w)',                          # 835 E 14 (no punctuation)
         ]
         
-        # Compile patterns for better performance
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.address_patterns]
+        # Single fused alternation of all patterns
+        self.combined_pattern = compile_address_patterns(tuple(self.address_patterns))
+        
+        # Optional Hyperscan DFA used to reject non-matching text before the regex runs
+        self.hs_db = self.build_hyperscan_db()
+        self.hs_local = threading.local()
         
         # URL filters to skip non-content URLs
         self.skip_url_patterns = [
@@ -50,33 +205,152 @@ class SLUSDCrawler:
         
         # Fast pre-check string for quick elimination
         self.quick_check = '835'
+        self.quick_check_bytes = self.quick_check.encode()
+        
+        # Only these content types are downloaded - images, archives, media etc. are dropped on headers
+        self.html_content_types = ('text/html', 'application/xhtml+xml')
+        
+        # Pick the fastest available BeautifulSoup parser once rather than retrying per page
+        try:
+            BeautifulSoup('<a/>', 'lxml')
+            self.html_parser = 'lxml'
+        except Exception:
+            self.html_parser = 'html.parser'
+        
+        # Concurrency settings - total fetches in flight, per-host cap and minimum per-host delay
+        self.concurrency = 32
+        self.per_host_limit = 4
+        self.request_delay = 0.2
+        self.pages_crawled = 0
+        
+        # PDFs larger than this are skipped rather than downloaded
+        self.max_pdf_size_mb = 100
+        
+        # PDF text extraction runs in PDFium (C++) in a few separate processes, started on first
+        # use; one that exceeds pdf_timeout is killed and replaced. Spawn rather than fork since
+        # the crawler is multi-threaded.
+        self.pdf_context = multiprocessing.get_context('spawn')
+        self.pdf_workers = Queue()
+        for _ in range(min(4, os.cpu_count() or 1)):
+            self.pdf_workers.put(None)
+        self.pdf_timeout = 60
         
         self.session = requests.Session()
         self.output_file = "slusd_address_audit.csv"
         self.progress_file = "crawl_progress.txt"
+        self.cache_file = "crawl_cache.db"
+        self.state_file = "crawl_state.db"
         
-        # Set headers to appear as a regular browser
+        # Set headers to appear as a regular browser, accept compressed bodies and keep connections alive
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive'
         })
         
+        # Size the connection pool for the PDF worker threads so connections are reused, not re-handshaked
+        adapter = HTTPAdapter(pool_connections=64, pool_maxsize=64,
+                              max_retries=Retry(total=2, backoff_factor=0.3))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Initialize CSV file with headers
         self.init_csv_file()
+        
+        # Content-hash cache so identical pages and PDFs are only scanned once, across runs
+        self.init_cache()
+        
+        # Visited set and frontier persisted to disk so an interrupted crawl can resume
+        self.init_state()
 
     def init_csv_file(self):
-        """Initialize CSV file with headers if it doesn't exist"""
-        if not os.path.exists(self.output_file):
-            with open(self.output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['URL', 'Type', 'Title', 'Address Found', 'Notes', 'Parent Page', 'Timestamp']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-
-    def append_to_csv(self, result):
-        """Append a single result to the CSV file immediately"""
-        with open(self.output_file, 'a', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['URL', 'Type', 'Title', 'Address Found', 'Notes', 'Parent Page', 'Timestamp']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writerow(result)
+        """Open the CSV file for the whole crawl, writing headers if it doesn't exist"""
+        write_header = not os.path.exists(self.output_file)
+        self.csv_fh = open(self.output_file, 'a', newline='', encoding='utf-8', buffering=1 << 16)
+        self.csv_writer = csv.writer(self.csv_fh)
+        if write_header:
+            self.csv_writer.writerow(FIELDNAMES)
+            self.csv_fh.flush()
+        atexit.register(self.csv_fh.close)
+
+    def append_to_csv(self, row):
+        """Write a result row (in FIELDNAMES order) to the CSV file"""
+        # Findings are rare, so each is flushed straight away and survives a crash
+        self.csv_writer.writerow(row)
+        self.csv_fh.flush()
+
+    def init_cache(self):
+        """Open the SQLite content-hash cache, creating the table if needed"""
+        self.cache = sqlite3.connect(self.cache_file, check_same_thread=False)
+        self.cache.execute('PRAGMA journal_mode=WAL')
+        self.cache.execute('PRAGMA synchronous=NORMAL')
+        self.cache.execute('''
+            CREATE TABLE IF NOT EXISTS content_cache (
+                sha256 BLOB PRIMARY KEY,
+                found INT,
+                matched TEXT,
+                title TEXT,
+                fetched_at INT
+            )''')
+        self.cache.commit()
+        self.cache_lock = threading.Lock()
+        
+        # Seed hashes with the patterns so editing them invalidates earlier results
+        self.cache_salt = hashlib.sha256('\n'.join(self.address_patterns).encode())
+
+    def content_digest(self, content):
+        """Return the cache key for a response body"""
+        digest = self.cache_salt.copy()
+        digest.update(content)
+        return digest.digest()
+
+    def cache_lookup(self, digest):
+        """Return cached (found, matched_text, title) for a digest, or None on a miss"""
+        with self.cache_lock:
+            row = self.cache.execute('SELECT found, matched, title FROM content_cache WHERE sha256 = ?',
+                                     (digest,)).fetchone()
+        if row is None:
+            return None
+        found, matched_text, title = row
+        return bool(found), matched_text, title
+
+    def cache_store(self, digest, found, matched_text, title=None):
+        """Save the scan result for a digest"""
+        with self.cache_lock:
+            self.cache.execute('INSERT OR REPLACE INTO content_cache VALUES (?, ?, ?, ?, ?)',
+                               (digest, int(found), matched_text, title, int(time.time())))
+            self.cache.commit()
+
+    def init_state(self):
+        """Open the crawl state DB and load the visited set and frontier of an unfinished crawl"""
+        self.state = sqlite3.connect(self.state_file)
+        self.state.execute('CREATE TABLE IF NOT EXISTS visited (url TEXT PRIMARY KEY)')
+        self.state.execute('CREATE TABLE IF NOT EXISTS frontier (url TEXT PRIMARY KEY)')
+        self.state.commit()
+        self.state_pending = 0
+        
+        self.visited_urls.update(url_hash(url) for (url,) in self.state.execute('SELECT url FROM visited'))
+        self.resume_frontier = [url for (url,) in self.state.execute('SELECT url FROM frontier')]
+        if self.resume_frontier:
+            print(f"Resuming crawl: {len(self.visited_urls)} visited, {len(self.resume_frontier)} queued")
+
+    def state_changed(self):
+        """Commit crawl state in batches of 100 changes"""
+        self.state_pending += 1
+        if self.state_pending >= 100:
+            self.state.commit()
+            self.state_pending = 0
+
+    def state_enqueue(self, url):
+        """Persist a newly queued URL"""
+        self.state.execute('INSERT OR IGNORE INTO frontier VALUES (?)', (url,))
+        self.state_changed()
+
+    def state_mark_visited(self, url):
+        """Move a URL from the persisted frontier to the visited table"""
+        self.state.execute('DELETE FROM frontier WHERE url = ?', (url,))
+        self.state.execute('INSERT OR IGNORE INTO visited VALUES (?)', (url,))
+        self.state_changed()
 
     def save_progress(self, pages_crawled, current_url):
         """Save progress to a file"""
@@ -90,7 +364,7 @@ class SLUSDCrawler:
     def is_valid_url(self, url):
         """Check if URL is valid and within the target domain"""
         try:
-            parsed = urlparse(url)
+            parsed = split_url(url)
             return (parsed.netloc == self.domain or parsed.netloc == '' or 
                     parsed.netloc.endswith('.slusd.us'))
         except Exception:
@@ -103,68 +377,127 @@ class SLUSDCrawler:
                 return True
         return False
 
-    def get_page_content(self, url):
-        """Fetch and return page content with better error handling"""
+    async def host_delay(self, http, scheme, host):
+        """Return the delay between requests to a host, honouring a larger robots.txt Crawl-delay"""
+        if host not in self.host_delays:
+            # Set the default first so concurrent callers don't fetch robots.txt again
+            self.host_delays[host] = self.request_delay
+            try:
+                async with http.get(f"{scheme}://{host}/robots.txt",
+                                    timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    if response.status == 200:
+                        robots = urllib.robotparser.RobotFileParser()
+                        robots.parse((await response.text(errors='replace')).splitlines())
+                        crawl_delay = robots.crawl_delay(self.session.headers['User-Agent'])
+                        if crawl_delay:
+                            self.host_delays[host] = max(self.request_delay, float(crawl_delay))
+                            print(f"Using robots.txt Crawl-delay of {self.host_delays[host]}s for {host}")
+            except Exception:
+                pass  # No usable robots.txt - keep the default delay
+        return self.host_delays[host]
+
+    async def wait_for_host_slot(self, http, parsed):
+        """Reserve the host's next send slot and sleep until it arrives - call while holding the host semaphore"""
+        # Politeness is per host, so other hosts keep fetching. No await between reading
+        # and updating the slot, so concurrent workers can't share one.
+        host = parsed.netloc
+        delay = await self.host_delay(http, parsed.scheme, host)
+        now = time.monotonic()
+        send_at = max(now, self.host_next_ok.get(host, 0))
+        self.host_next_ok[host] = send_at + delay
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+
+    async def fetch(self, http, url):
+        """Fetch page content asynchronously, returning (body, content_type, encoding, final_url) - body is HTML only"""
+        parsed = split_url(url)
+        host = parsed.netloc
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            # Try to detect encoding
-            content_type = response.headers.get('content-type', '')
-            if 'charset=' in content_type:
-                encoding = content_type.split('charset=')[1].split(';')[0].strip()
-                response.encoding = encoding
-            
-            return response.text, content_type
-        except requests.RequestException as e:
+            async with self.host_semaphores[host]:
+                await self.wait_for_host_slot(http, parsed)
+                
+                async with http.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    response.raise_for_status()
+                    content_type = response.headers.get('content-type', '')
+                    
+                    # Decide from the headers alone - leaving the block unread aborts the transfer
+                    if 'pdf' in content_type.lower():
+                        return None, content_type, None, None
+                    if content_type and not content_type.lower().startswith(self.html_content_types):
+                        return None, None, None, None
+                    
+                    # Raw bytes are returned so hashing, scanning and decoding happen off the event loop.
+                    # aiohttp picks up the charset from content-type and falls back to detection
+                    body = await response.read()
+                    
+                    # Relative links resolve against the URL actually served, since canonical
+                    # URLs drop the trailing slash that the server may redirect back to
+                    return body, content_type, response.get_encoding(), str(response.url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"Error fetching {url}: {e}")
-            return None, None
+            return None, None, None, None
         except Exception as e:
             print(f"Unexpected error fetching {url}: {e}")
-            return None, None
+            return None, None, None, None
 
     def safe_parse_html(self, html_content):
-        """Parse HTML with multiple parser fallbacks"""
-        parsers = ['html.parser', 'lxml', 'html5lib']
-        
-        for parser in parsers:
+        """Parse HTML with the parser chosen at startup, falling back to html.parser"""
+        if self.html_parser != 'html.parser':
             try:
-                return BeautifulSoup(html_content, parser)
-            except Exception as e:
-                print(f"Parser {parser} failed, trying next...")
-                continue
+                return BeautifulSoup(html_content, self.html_parser)
+            except Exception:
+                print(f"Parser {self.html_parser} failed, trying html.parser...")
         
-        # If all parsers fail, try with error handling
         try:
-            # Remove problematic characters and try again
-            cleaned_html = re.sub(r'[^\x00-\x7F]+', ' ', html_content)
-            return BeautifulSoup(cleaned_html, 'html.parser')
+            return BeautifulSoup(html_content, 'html.parser')
         except Exception as e:
             print(f"All parsers failed: {e}")
             return None
 
-    def extract_links(self, html, base_url):
-        """Extract all links from HTML content with better error handling"""
+    def find_hrefs(self, html):
+        """Return href values of <a> and <link> tags, using selectolax or lxml's C parser when possible"""
+        if HTMLParser is not None:
+            try:
+                # Parse and select in a single C pass
+                tree = HTMLParser(html)
+                hrefs = (node.attributes.get('href') for node in tree.css('a[href], link[href]'))
+                return [href for href in hrefs if href is not None]
+            except Exception:
+                pass  # Fall through to lxml
+        
         try:
+            root = lxml.html.fromstring(html)
+            return [element.get('href') for element in root.iter('a', 'link')
+                    if element.get('href') is not None]
+        except Exception:
+            # lxml rejects some input (e.g. str with an XML encoding declaration), use BeautifulSoup
             soup = self.safe_parse_html(html)
             if not soup:
-                return set()
-            
+                return []
+            return [tag['href'] for tag in soup.find_all(['a', 'link'], href=True)]
+
+    def extract_text_and_title(self, html_content):
+        """Return (text, title) for a page, using lxml's C tree walk when possible"""
+        try:
+            root = lxml.html.fromstring(html_content)
+            title = root.findtext('.//title')
+            return root.text_content(), (title.strip() if title else 'No title')
+        except Exception:
+            soup = self.safe_parse_html(html_content)
+            if not soup:
+                return None, None
+            return soup.get_text(), (soup.title.string if soup.title else 'No title')
+
+    def extract_links(self, html, base_url):
+        """Extract all links from HTML content with better error handling"""
+        try:
             links = set()
             
             # Find all links
-            for tag in soup.find_all(['a', 'link'], href=True):
+            for href in self.find_hrefs(html):
                 try:
-                    href = tag['href']
                     full_url = urljoin(base_url, href)
-                    
-                    # Clean up the URL (remove fragments)
-                    parsed = urlparse(full_url)
-                    clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                    if parsed.query:
-                        clean_url += f"?{parsed.query}"
-                    
-                    links.add(clean_url)
+                    links.add(canonicalize_url(full_url))
                 except Exception as e:
                     continue  # Skip problematic links
             
@@ -173,6 +506,46 @@ class SLUSDCrawler:
             print(f"Error extracting links: {e}")
             return set()
 
+    def build_hyperscan_db(self):
+        """Compile address patterns into a Hyperscan database, or return None if unavailable"""
+        if hyperscan is None:
+            return None
+        
+        try:
+            # Hyperscan has no lookahead support, so compile in prefilter mode: it may report
+            # false positives (confirmed by the fused regex) but never misses a real match.
+            # UTF8 + UCP give \s the same Unicode meaning as in re, so e.g. non-breaking spaces match
+            flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_PREFILTER |
+                     hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP)
+            db = hyperscan.Database()
+            db.compile(expressions=[pattern.encode() for pattern in self.address_patterns],
+                       ids=list(range(len(self.address_patterns))),
+                       flags=[flags] * len(self.address_patterns))
+            return db
+        except Exception as e:
+            print(f"Hyperscan unavailable, using regex only: {e}")
+            return None
+
+    def hyperscan_match(self, text):
+        """Return True if the Hyperscan database reports a possible address match in str text"""
+        # Scratch space is not thread safe, so each worker thread gets its own
+        scratch = getattr(self.hs_local, 'scratch', None)
+        if scratch is None:
+            scratch = self.hs_local.scratch = hyperscan.Scratch(self.hs_db)
+        
+        hits = []
+        
+        def on_match(pattern_id, start, end, flags, context):
+            hits.append(pattern_id)
+            return 1  # Halt the scan on the first hit
+        
+        # The database is compiled in UTF-8 mode, so it must only ever see valid UTF-8
+        try:
+            self.hs_db.scan(text.encode('utf-8', 'ignore'), match_event_handler=on_match, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            pass
+        return bool(hits)
+
     def check_address_in_text(self, text):
         """Check if any of the target address patterns are mentioned in text"""
         try:
@@ -183,66 +556,98 @@ class SLUSDCrawler:
             if self.quick_check not in text:
                 return False, None
             
-            # Check each pattern - return immediately on first match
-            for i, pattern in enumerate(self.compiled_patterns):
-                match = pattern.search(text)
-                if match:
-                    return True, match.group()
+            # Single DFA pass rules out most remaining text without backtracking
+            if self.hs_db is not None and not self.hyperscan_match(text):
+                return False, None
+            
+            # One traversal of the fused alternation finds the matched text
+            match = self.combined_pattern.search(text)
+            if match:
+                return True, match.group()
             
             return False, None
         except Exception:
             return False, None
 
-    def check_pdf_content(self, url):
-        """Download and check PDF content for the target address"""
-        try:
-            # Check file size first to avoid huge downloads
-            response = self.session.head(url, timeout=5)
-            if response.headers.get('content-length'):
-                size_mb = int(response.headers['content-length']) / (1024 * 1024)
-                if size_mb > 100:  # Skip PDFs larger than 50MB
-                    print(f"Skipping large PDF ({size_mb:.1f}MB): {url}")
-                    return False, None
-            
-            response = self.session.get(url, timeout=15)
+    def download_pdf(self, url):
+        """Stream a PDF into memory, returning its bytes or None if skipped - runs in a worker thread"""
+        max_bytes = self.max_pdf_size_mb * 1024 * 1024
+        with self.session.get(url, stream=True, timeout=15) as response:
             response.raise_for_status()
             
-            # Read PDF content
-            pdf_file = io.BytesIO(response.content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            # Links ending in .pdf sometimes serve an HTML error or login page instead
+            content_type = response.headers.get('content-type', '')
+            if content_type and 'pdf' not in content_type.lower():
+                print(f"Skipping non-PDF response ({content_type}): {url}")
+                return None
             
-            # Check each page and return immediately on first match
-            for page_num, page in enumerate(pdf_reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    
-                    # Quick pre-check before expensive regex
-                    if self.quick_check in page_text:
-                        found, matched_text = self.check_address_in_text(page_text)
-                        if found:
-                            return True, matched_text  # Stop as soon as we find a match
-                except Exception:
-                    continue  # Skip pages that can't be read
+            # Check declared size first to avoid huge downloads
+            content_length = response.headers.get('content-length')
+            if content_length and int(content_length) > max_bytes:
+                size_mb = int(content_length) / (1024 * 1024)
+                print(f"Skipping large PDF ({size_mb:.1f}MB): {url}")
+                return None
             
-            return False, None  # No matches found in any page
+            # Stream the body in chunks, giving up if it grows past the size limit
+            pdf_file = io.BytesIO()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                pdf_file.write(chunk)
+                if pdf_file.tell() > max_bytes:
+                    print(f"Skipping large PDF (over {self.max_pdf_size_mb}MB): {url}")
+                    return None
+        return pdf_file.getvalue()
+
+    def scan_pdf(self, pdf_bytes):
+        """Check a downloaded PDF page by page for the target address - runs in a worker thread"""
+        # Identical PDFs (mirrors, earlier runs) skip text extraction entirely
+        digest = self.content_digest(pdf_bytes)
+        cached = self.cache_lookup(digest)
+        if cached:
+            found, matched_text, _ = cached
+            return found, matched_text
+        
+        # Waiting for a free worker doesn't count against pdf_timeout
+        worker = self.pdf_workers.get()
+        try:
+            if worker is None:
+                worker = PdfWorker(self.pdf_context)
+            found, matched_text = worker.extract(pdf_bytes, self.address_patterns,
+                                                 self.quick_check, self.pdf_timeout)
+        except (EOFError, OSError):
+            # Timed out or crashed - kill it so the next PDF gets a fresh process
+            if worker is not None:
+                worker.kill()
+                worker = None
+            raise
+        finally:
+            self.pdf_workers.put(worker)
+        self.cache_store(digest, found, matched_text)
+        return found, matched_text
+
+    async def check_pdf_content(self, http, url):
+        """Download a PDF within the host's politeness limits, then check it for the target address"""
+        loop = asyncio.get_running_loop()
+        parsed = split_url(url)
+        try:
+            # PDF downloads share the per-host cap and send slots (and Crawl-delay) with page fetches
+            async with self.host_semaphores[parsed.netloc]:
+                await self.wait_for_host_slot(http, parsed)
+                pdf_bytes = await loop.run_in_executor(self.executor, self.download_pdf, url)
+            if pdf_bytes is None:
+                return False, None
             
+            # Extraction happens after the host slot is released
+            return await loop.run_in_executor(self.executor, self.scan_pdf, pdf_bytes)
         except Exception as e:
             print(f"Error reading PDF {url}: {e}")
             return False, None
 
     def record_finding(self, url, content_type, matched_text, title="", notes="", parent_page=""):
-        """Record a finding and immediately save to CSV"""
+        """Record a finding and queue it for the CSV file"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        result = {
-            'URL': url,
-            'Type': content_type,
-            'Title': title,
-            'Address Found': matched_text,
-            'Notes': notes,
-            'Parent Page': parent_page,
-            'Timestamp': timestamp
-        }
+        row = (url, content_type, title, matched_text, notes, parent_page, timestamp)
+        result = dict(zip(FIELDNAMES, row))
         
         # Add to in-memory lists
         if content_type == 'PDF':
@@ -250,95 +655,175 @@ class SLUSDCrawler:
         else:
             self.found_pages.append(result)
         
-        # Immediately save to CSV
-        self.append_to_csv(result)
+        # Queue for the next batched CSV write
+        self.append_to_csv(row)
         
         if parent_page:
             print(f"✓ Found '{matched_text}' in {content_type}: {url} (linked from: {parent_page})")
         else:
             print(f"✓ Found '{matched_text}' in {content_type}: {url}")
 
-    def crawl_site(self, max_pages=500):
-        """Main crawling function with improved error handling"""
-        print(f"Starting crawl of {self.base_url}")
-        print(f"Looking for pages and PDFs containing address patterns:")
-        for i, pattern in enumerate(self.address_patterns, 1):
-            print(f"  {i}. {pattern}")
-        print(f"Results will be saved continuously to: {self.output_file}")
+    def scan_page(self, body, encoding, url):
+        """Scan an HTML page and return (found, matched_text, title, links) - runs in a worker thread"""
+        html_content = body.decode(encoding, errors='replace')
+        
+        # Identical content seen before (mirror URL or earlier run) skips the text scan
+        digest = self.content_digest(body)
+        cached = self.cache_lookup(digest)
+        if cached:
+            found, matched_text, title = cached
+        else:
+            # Only pages with the quick-check literal in their raw bytes can match, so the rest skip
+            # text extraction. The regex runs on the text so entities and inline tags (835&nbsp;E.,
+            # <b>835</b> E.) don't hide the address
+            found, matched_text, title = False, None, None
+            if self.quick_check_bytes in body:
+                page_text, page_title = self.extract_text_and_title(html_content)
+                found, matched_text = self.check_address_in_text(page_text)
+                if found:
+                    title = page_title
+            self.cache_store(digest, found, matched_text, title)
         
-        # Queue for URLs to visit
-        url_queue = deque([self.base_url])
-        pages_crawled = 0
+        links = self.extract_links(html_content, url)
+        return found, matched_text, title, links
+
+    async def process_url(self, http, queue, current_url):
+        """Fetch a single URL, record any findings and queue newly discovered links"""
+        loop = asyncio.get_running_loop()
         
-        while url_queue and pages_crawled < max_pages:
-            current_url = url_queue.popleft()
-            
-            if current_url in self.visited_urls:
-                continue
-                
-            self.visited_urls.add(current_url)
-            pages_crawled += 1
-            
-            print(f"Crawling ({pages_crawled}/{max_pages}): {current_url}")
-            
-            # Save progress every 50 pages
-            if pages_crawled % 50 == 0:
-                self.save_progress(pages_crawled, current_url)
-            
-            try:
-                # Get page content
-                html_content, content_type = self.get_page_content(current_url)
-                if not html_content:
-                    continue
+        # Get page content
+        body, content_type, encoding, final_url = await self.fetch(http, current_url)
+        
+        # Check if this is a PDF accessed directly
+        if content_type and 'pdf' in content_type.lower():
+            found, matched_text = await self.check_pdf_content(http, current_url)
+            if found:
+                self.record_finding(current_url, 'PDF', matched_text, notes='PDF document (direct access)')
+            return
+        
+        if not body:
+            return
+        
+        # Decoding, scanning and parsing are CPU bound, keep them off the event loop
+        found, matched_text, title, links = await loop.run_in_executor(
+            self.executor, self.scan_page, body, encoding, final_url)
+        if found:
+            self.record_finding(current_url, 'HTML Page', matched_text, title=title, notes='HTML page content')
+        
+        # Queue new links
+        for link in links:
+            link_hash = url_hash(link)
+            if (self.is_valid_url(link) and 
+                not self.should_skip_url(link) and  # Skip asset files
+                link_hash not in self.visited_urls and 
+                link_hash not in self.queued_urls):
                 
-                # Check if this is a PDF accessed directly
-                if content_type and 'pdf' in content_type.lower():
-                    found, matched_text = self.check_pdf_content(current_url)
+                # Check if it's a PDF link
+                if link.lower().endswith('.pdf'):
+                    if link_hash in self.visited_pdfs:
+                        continue
+                    self.visited_pdfs.add(link_hash)
+                    
+                    found, matched_text = await self.check_pdf_content(http, link)
                     if found:
-                        self.record_finding(current_url, 'PDF', matched_text, notes='PDF document (direct access)')
+                        self.record_finding(link, 'PDF', matched_text, 
+                                          notes='PDF document (linked)', 
+                                          parent_page=current_url)
+                else:
+                    queue.put_nowait(link)
+                    self.queued_urls.add(link_hash)
+                    self.state_enqueue(link)
+
+    async def worker(self, http, queue, max_pages):
+        """Pull URLs off the shared queue until the crawl is cancelled"""
+        while True:
+            current_url = await queue.get()
+            current_hash = url_hash(current_url)
+            self.queued_urls.discard(current_hash)
+            try:
+                # URLs left over at max_pages stay in the persisted frontier for the next run
+                if current_hash in self.visited_urls or self.pages_crawled >= max_pages:
                     continue
                 
-                # Parse HTML content with safe parsing
-                soup = self.safe_parse_html(html_content)
-                if not soup:
-                    print(f"Could not parse HTML for {current_url}")
-                    continue
+                self.visited_urls.add(current_hash)
+                self.pages_crawled += 1
                 
-                page_text = soup.get_text()
+                print(f"Crawling ({self.pages_crawled}/{max_pages}): {current_url}")
                 
-                # Check if page contains any target address patterns
-                found, matched_text = self.check_address_in_text(page_text)
-                if found:
-                    title = soup.title.string if soup.title else 'No title'
-                    self.record_finding(current_url, 'HTML Page', matched_text, title=title, notes='HTML page content')
+                # Save progress every 50 pages
+                if self.pages_crawled % 50 == 0:
+                    self.save_progress(self.pages_crawled, current_url)
                 
-                # Extract and queue new links
-                links = self.extract_links(html_content, current_url)
-                for link in links:
-                    if (self.is_valid_url(link) and 
-                        not self.should_skip_url(link) and  # Skip asset files
-                        link not in self.visited_urls and 
-                        link not in url_queue):
-                        
-                        # Check if it's a PDF link
-                        if link.lower().endswith('.pdf'):
-                            found, matched_text = self.check_pdf_content(link)
-                            if found:
-                                self.record_finding(link, 'PDF', matched_text, 
-                                                  notes='PDF document (linked)', 
-                                                  parent_page=current_url)
-                        else:
-                            url_queue.append(link)
+                try:
+                    await self.process_url(http, queue, current_url)
+                except Exception as e:
+                    print(f"Error processing {current_url}: {e}")
                 
+                # Only finished pages are persisted as visited, so pages cut off by an interruption
+                # stay in the frontier and are crawled again on resume
+                self.state_mark_visited(current_url)
             except Exception as e:
                 print(f"Error processing {current_url}: {e}")
-                continue
-            
-            # Rate limiting - reduced for faster crawling
-            time.sleep(0.2)
+            finally:
+                queue.task_done()
+
+    async def crawl_async(self, max_pages):
+        """Run a pool of concurrent workers over a shared URL queue"""
+        self.host_semaphores = defaultdict(lambda: asyncio.Semaphore(self.per_host_limit))
+        self.host_next_ok = {}
+        self.host_delays = {}
+        
+        # Queue for URLs to visit - an unfinished crawl picks up its saved frontier
+        queue = asyncio.Queue()
+        start_urls = self.resume_frontier or [self.base_url]
+        for url in start_urls:
+            queue.put_nowait(url)
+            self.state_enqueue(url)
+        self.queued_urls = {url_hash(url) for url in start_urls}
+        
+        headers = {
+            'User-Agent': self.session.headers['User-Agent'],
+            'Accept-Encoding': ACCEPT_ENCODING
+        }
+        connector = aiohttp.TCPConnector(limit=64)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as self.executor:
+            async with aiohttp.ClientSession(headers=headers, connector=connector) as http:
+                workers = []
+                try:
+                    workers = [asyncio.create_task(self.worker(http, queue, max_pages))
+                               for _ in range(self.concurrency)]
+                    
+                    # Workers run until every queued URL has been handled
+                    await queue.join()
+                finally:
+                    # Stop the workers (also on Ctrl-C) before the session closes under them, so a
+                    # page cut off mid-fetch is never marked visited
+                    for task in workers:
+                        task.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+
+    def crawl_site(self, max_pages=500):
+        """Main crawling function with improved error handling"""
+        print(f"Starting crawl of {self.base_url}")
+        print(f"Looking for pages and PDFs containing address patterns:")
+        for i, pattern in enumerate(self.address_patterns, 1):
+            print(f"  {i}. {pattern}")
+        print(f"Results will be saved continuously to: {self.output_file}")
+        print(f"Fetching with {self.concurrency} workers ({self.per_host_limit} per host)")
+        
+        self.pages_crawled = 0
+        try:
+            asyncio.run(self.crawl_async(max_pages))
+        finally:
+            self.state.commit()
+        
+        # An empty frontier means the site was fully crawled, so the next run starts fresh
+        if not self.state.execute('SELECT 1 FROM frontier LIMIT 1').fetchone():
+            self.state.execute('DELETE FROM visited')
+            self.state.commit()
         
-        print(f"\nCrawl completed. Visited {pages_crawled} pages.")
-        self.save_progress(pages_crawled, "COMPLETED")
+        print(f"\nCrawl completed. Visited {self.pages_crawled} pages.")
+        self.save_progress(self.pages_crawled, "COMPLETED")
 
     def print_summary(self):
         """Print a summary of findings"""
@@ -392,12 +877,13 @@ def main():
 if __name__ == "__main__":
     # Install required packages if not already installed
     try:
-        import PyPDF2
+        import pypdfium2
+        import aiohttp
         import requests
         from bs4 import BeautifulSoup
     except ImportError:
         print("Missing required packages. Install them with:")
-        print("pip install requests beautifulsoup4 PyPDF2")
+        print("pip install requests aiohttp beautifulsoup4 pypdfium2")
         exit(1)
     
     main()
\ No newline at end of file
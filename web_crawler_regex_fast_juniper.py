@@ -4,79 +4,348 @@ SLUSD Website Crawler - Find pages and PDFs containing "14735 Juniper St"
 Crawls www.slusd.us to identify content that needs address updates
 """
 
-import requests
+import asyncio
+import atexit
+import httpx
 from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+import lxml.etree
 from urllib.parse import urljoin, urlparse
 import csv
-import time
+import functools
+import multiprocessing
+import random
 import re
-from collections import deque
-import PyPDF2
+import sqlite3
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import pypdf
 import io
 import os
 from datetime import datetime
 
+FIELDNAMES = ['URL', 'Type', 'Title', 'Address Found', 'Notes', 'Parent Page', 'Timestamp']
+
+# Responses worth retrying after a backoff - throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Regular browser User-Agents, one per pooled session
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 Edg/91.0.864.59',
+]
+
+
+@functools.lru_cache(maxsize=None)
+def compile_address_pattern(pattern):
+    """Compile the address pattern once per process"""
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def check_address_in_text(text, pattern, quick_check):
+    """Check if the target address pattern is mentioned in text"""
+    try:
+        if not text:
+            return False, None
+        
+        # Quick pre-check: if '14735' isn't in the text, skip expensive regex
+        if quick_check not in text:
+            return False, None
+        
+        # One pass over the text covers every address variant
+        match = compile_address_pattern(pattern).search(text)
+        return (True, match.group()) if match else (False, None)
+    except Exception:
+        return False, None
+
+
+def safe_parse_html(html_content):
+    """Parse HTML with multiple parser fallbacks"""
+    parsers = ['html.parser', 'lxml', 'html5lib']
+    
+    for parser in parsers:
+        try:
+            return BeautifulSoup(html_content, parser)
+        except Exception as e:
+            print(f"Parser {parser} failed, trying next...")
+            continue
+    
+    # If all parsers fail, try with error handling
+    try:
+        # Remove problematic characters and try again
+        if isinstance(html_content, bytes):
+            html_content = html_content.decode('utf-8', errors='replace')
+        cleaned_html = re.sub(r'[^\x00-\x7F]+', ' ', html_content)
+        return BeautifulSoup(cleaned_html, 'html.parser')
+    except Exception as e:
+        print(f"All parsers failed: {e}")
+        return None
+
+
+def extract_links(hrefs, base_url):
+    """Resolve the href values found on a page into clean absolute links"""
+    try:
+        links = set()
+        
+        for href in hrefs:
+            try:
+                full_url = urljoin(base_url, href)
+                
+                # Clean up the URL (remove fragments)
+                parsed = urlparse(full_url)
+                clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+                if parsed.query:
+                    clean_url += f"?{parsed.query}"
+                
+                links.add(clean_url)
+            except Exception as e:
+                continue  # Skip problematic links
+        
+        return links
+    except Exception as e:
+        print(f"Error extracting links: {e}")
+        return set()
+
+
+def extract_title(html_content):
+    """Return the page title, parsing only as far as the closing </title> tag"""
+    parser = lxml.etree.HTMLPullParser(events=('end',), tag='title')
+    try:
+        # Feed in chunks so the rest of the document is never parsed once the title is seen
+        for start in range(0, len(html_content), 8192):
+            parser.feed(html_content[start:start + 8192])
+            for _, element in parser.read_events():
+                return element.text
+    except lxml.etree.LxmlError:
+        pass
+    return None
+
+
+def scan_html(html_bytes, encoding, base_url, pattern, quick_check):
+    """Parse a page and check it for the address - runs in a worker process"""
+    # Text can only contain the address if the raw bytes have the quick-check string,
+    # so most pages are parsed straight from bytes for their links and never decoded
+    needs_text = quick_check.encode() in html_bytes
+    
+    html_content = html_bytes
+    if needs_text:
+        try:
+            html_content = html_bytes.decode(encoding or 'utf-8', errors='replace')
+        except LookupError:
+            html_content = html_bytes.decode('utf-8', errors='replace')  # Unknown charset name
+    
+    dom = HTMLParser(html_content)
+    if dom.body is not None:
+        page_text = dom.text(separator=' ') if needs_text else None  # Head (title) too, like get_text()
+        hrefs = [node.attributes.get('href') for node in dom.css('a[href], link[href]')]
+    else:
+        # selectolax found no body, so fall back to BeautifulSoup's more forgiving parsers
+        soup = safe_parse_html(html_content)
+        if not soup:
+            return None
+        page_text = soup.get_text() if needs_text else None
+        hrefs = [tag['href'] for tag in soup.find_all(['a', 'link'], href=True)]
+    
+    found, matched_text = check_address_in_text(page_text, pattern, quick_check)
+    # The title is only recorded for matches, so it is never looked up for other pages
+    title = (extract_title(html_content) or 'No title') if found else None
+    
+    return found, matched_text, title, extract_links([href for href in hrefs if href], base_url)
+
+
+def scan_pdf(pdf_bytes, pattern, quick_check):
+    """Check each page of a PDF for the address - runs in a worker process"""
+    pdf_reader = pypdf.PdfReader(io.BytesIO(pdf_bytes))
+    
+    # Check each page and return immediately on first match
+    for page in pdf_reader.pages:
+        try:
+            # check_address_in_text starts with the quick pre-check, so each page is scanned for it once
+            found, matched_text = check_address_in_text(page.extract_text(), pattern, quick_check)
+            if found:
+                return True, matched_text  # Stop as soon as we find a match
+        except Exception:
+            continue  # Skip pages that can't be read
+    
+    return False, None  # No matches found in any page
+
+
+class TokenBucket:
+    """Per-host rate limiter allowing short bursts up to capacity, then rate requests per second"""
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+
+    async def acquire(self):
+        """Wait just long enough for a token, then take it"""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class SessionPool:
+    """HTTP/2 clients with distinct User-Agents (and optional proxies), retired after repeated errors"""
+    def __init__(self, size=10, user_agents=USER_AGENTS, proxies=None, max_errors=3, retries=3):
+        limits = httpx.Limits(max_connections=50, max_keepalive_connections=50)
+        self.sessions = []
+        for i in range(size):
+            # HTTP/2 multiplexes concurrent requests over one kept-alive connection per host;
+            # the transport also retries failed connection attempts
+            proxy = proxies[i % len(proxies)] if proxies else None
+            transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=retries, proxy=proxy)
+            self.sessions.append(httpx.AsyncClient(transport=transport, timeout=10, follow_redirects=True,
+                                                   headers={'User-Agent': user_agents[i % len(user_agents)]}))
+        self.active = list(self.sessions)
+        self.errors = {session: 0 for session in self.sessions}
+        self.max_errors = max_errors
+
+    def get(self):
+        """Pick a random session that hasn't been retired (any session once all are)"""
+        return random.choice(self.active or self.sessions)
+
+    def mark_good(self, session):
+        """Reset a session's error count after a successful response"""
+        self.errors[session] = 0
+
+    def mark_bad(self, session):
+        """Count a throttled or failed response, retiring the session after max_errors in a row"""
+        self.errors[session] += 1
+        if self.errors[session] >= self.max_errors and session in self.active:
+            self.active.remove(session)
+            print(f"Retiring session after {self.errors[session]} errors: {session.headers['User-Agent']}")
+
+    async def aclose(self):
+        """Close every session's connections"""
+        for session in self.sessions:
+            await session.aclose()
+
+
 class SLUSDCrawler:
     def __init__(self, base_url="https://www.slusd.us"):
         self.base_url = base_url
         self.domain = urlparse(base_url).netloc
-        self.visited_urls = set()
+        self.pages_crawled = 0
         self.found_pages = []
         self.found_pdfs = []
         
-        # Define address patterns to search for - multiple patterns for better coverage
-        self.address_patterns = [
-            r'14735\s*Juniper\s*(?:St\.?|Street)?(?!\w)',   # Comprehensive pattern
-            r'14735\s*Juniper\s*St\.?',                     # 14735 Juniper St variations
-            r'14735\s*Juniper\s*Street',                    # 14735 Juniper Street
-            r'14735\s*Juniper(?!\w)',                       # 14735 Juniper (no street)
-            r'14735\s*(?:N\.?\s*)?Juniper\s*(?:St\.?|Street)?', # With North prefix
-            r'14735\s*North\s*Juniper\s*(?:St\.?|Street)?', # 14735 North Juniper variations
-            r'14735\s*N\s*Juniper(?!\w)',                   # 14735 N Juniper (no punctuation)
-        ]
-        
-        # Compile patterns for better performance
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.address_patterns]
-        
-        # URL filters to skip non-content URLs
-        self.skip_url_patterns = [
-            r'/css/', r'/js/', r'/images/', r'/img/', r'/assets/',
-            r'\.css$', r'\.js$', r'\.png$', r'\.jpg$', r'\.jpeg$', r'\.gif$', r'\.ico$',
-            r'\.woff$', r'\.woff2$', r'\.ttf$', r'\.eot$', r'\.svg$', r'\.webp$',
-            r'/feeds/', r'/rss/', r'/sitemap', r'\.xml$', r'\.json$',
-            r'#', r'javascript:', r'mailto:', r'tel:', r'ftp:'
-        ]
-        self.compiled_skip_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.skip_url_patterns]
+        # Address pattern to search for - a single regex covers every variant:
+        # optional N/N./North prefix, optional St/St./Street suffix, any spacing
+        self.address_pattern = r'14735\s*(?:N\.?\s*|North\s*)?Juniper(?:\s*(?:St\.?|Street))?(?!\w)'
+        
+        # URL filters to skip non-content URLs - literal suffixes and prefixes need no regex,
+        # and the remaining path fragments share one compiled alternation
+        self.skip_url_suffixes = (
+            '.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.ico',
+            '.woff', '.woff2', '.ttf', '.eot', '.svg', '.webp', '.xml', '.json'
+        )
+        self.skip_url_prefixes = ('#', 'javascript:', 'mailto:', 'tel:', 'ftp:')
+        self.skip_url_pattern = re.compile(r'/css/|/js/|/images/|/img/|/assets/|/feeds/|/rss/|/sitemap',
+                                           re.IGNORECASE)
         
         # Fast pre-check string for quick elimination
         self.quick_check = '14735'
         
-        self.session = requests.Session()
+        # PDFs larger than this are skipped rather than downloaded
+        self.max_pdf_size_mb = 50
+        
+        # Worker coroutines sharing a pool of HTTP/2 sessions; per_host_limit caps requests in flight to a host
+        # and requests_per_second caps how fast they start, so the crawl stays polite at any worker count
+        self.max_workers = 20
+        self.per_host_limit = 10
+        self.requests_per_second = 10
+        
+        # Requests rotate across sessions with different User-Agents; set proxies to a list of
+        # proxy URLs to also spread them across IPs (assigned round-robin to sessions)
+        self.session_pool_size = 10
+        self.proxies = None
+        
+        # Pages answered with a RETRY_STATUSES code are retried with exponential backoff
+        self.max_retries = 3
+        self.retry_backoff = 0.5
+        self.max_retry_after = 60  # Longest Retry-After (seconds) worth waiting for
+        
         self.output_file = "slusd_juniper_audit.csv"
         self.progress_file = "crawl_progress_juniper.txt"
-        
-        # Set headers to appear as a regular browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.state_file = "crawl_state_juniper.db"
         
         # Initialize CSV file with headers
         self.init_csv_file()
+        
+        # Visited URLs and the queue live on disk so an interrupted crawl can resume
+        self.init_state()
 
     def init_csv_file(self):
-        """Initialize CSV file with headers if it doesn't exist"""
-        if not os.path.exists(self.output_file):
-            with open(self.output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['URL', 'Type', 'Title', 'Address Found', 'Notes', 'Parent Page', 'Timestamp']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
+        """Open the CSV file for the whole crawl, writing headers if it doesn't exist"""
+        write_header = not os.path.exists(self.output_file)
+        
+        # Line buffered, so each finding still reaches disk as soon as it is written
+        self.csv_fh = open(self.output_file, 'a', newline='', encoding='utf-8', buffering=1)
+        self.csv_writer = csv.DictWriter(self.csv_fh, fieldnames=FIELDNAMES)
+        if write_header:
+            self.csv_writer.writeheader()
+        atexit.register(self.csv_fh.close)
 
     def append_to_csv(self, result):
         """Append a single result to the CSV file immediately"""
-        with open(self.output_file, 'a', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['URL', 'Type', 'Title', 'Address Found', 'Notes', 'Parent Page', 'Timestamp']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writerow(result)
+        self.csv_writer.writerow(result)
+
+    def init_state(self):
+        """Open the crawl state DB and load the queue of an unfinished crawl"""
+        self.state = sqlite3.connect(self.state_file)
+        
+        # WAL with relaxed syncing keeps the many small writes cheap
+        self.state.execute('PRAGMA journal_mode=WAL')
+        self.state.execute('PRAGMA synchronous=NORMAL')
+        self.state.execute('CREATE TABLE IF NOT EXISTS visited (url TEXT PRIMARY KEY)')
+        self.state.execute('CREATE TABLE IF NOT EXISTS queue (url TEXT PRIMARY KEY, state TEXT)')
+        self.state.commit()
+        self.state_pending = 0
+        
+        # Pages still being crawled when the last run stopped are queued again
+        self.resume_queue = [url for (url,) in self.state.execute('SELECT url FROM queue')]
+        if self.resume_queue:
+            visited = self.state.execute('SELECT COUNT(*) FROM visited').fetchone()[0]
+            print(f"Resuming crawl: {visited} visited, {len(self.resume_queue)} queued")
+
+    def state_changed(self):
+        """Commit crawl state in batches of 100 changes"""
+        self.state_pending += 1
+        if self.state_pending >= 100:
+            self.state.commit()
+            self.state_pending = 0
+
+    def url_seen(self, url):
+        """Check whether a URL has already been visited or queued"""
+        row = self.state.execute('SELECT 1 FROM visited WHERE url = ? UNION ALL '
+                                 'SELECT 1 FROM queue WHERE url = ? LIMIT 1', (url, url)).fetchone()
+        return row is not None
+
+    def state_enqueue(self, url):
+        """Persist a newly queued URL"""
+        self.state.execute("INSERT OR IGNORE INTO queue VALUES (?, 'queued')", (url,))
+        self.state_changed()
+
+    def state_start(self, url):
+        """Mark a queued URL as being crawled"""
+        self.state.execute("UPDATE queue SET state = 'crawling' WHERE url = ?", (url,))
+        self.state_changed()
+
+    def state_mark_visited(self, url):
+        """Move a crawled URL from the queue to the visited table"""
+        self.state.execute('DELETE FROM queue WHERE url = ?', (url,))
+        self.state.execute('INSERT OR IGNORE INTO visited VALUES (?)', (url,))
+        self.state_changed()
 
     def save_progress(self, pages_crawled, current_url):
         """Save progress to a file"""
@@ -98,133 +367,105 @@ class SLUSDCrawler:
 
     def should_skip_url(self, url):
         """Check if URL should be skipped (assets, etc.)"""
-        for pattern in self.compiled_skip_patterns:
-            if pattern.search(url):
-                return True
-        return False
+        lowered = url.lower()
+        return (lowered.endswith(self.skip_url_suffixes) or
+                lowered.startswith(self.skip_url_prefixes) or
+                self.skip_url_pattern.search(url) is not None)
 
-    def get_page_content(self, url):
+    async def get_page_content(self, pool, url):
         """Fetch and return page content with better error handling"""
+        host = urlparse(url).netloc
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            # Try to detect encoding
-            content_type = response.headers.get('content-type', '')
-            if 'charset=' in content_type:
-                encoding = content_type.split('charset=')[1].split(';')[0].strip()
-                response.encoding = encoding
-            
-            return response.text, content_type
-        except requests.RequestException as e:
+            async with self.host_semaphores[host]:
+                for attempt in range(self.max_retries + 1):
+                    await self.rate_limiters[host].acquire()
+                    
+                    # Each attempt may go out through a different session. The body is streamed
+                    # so PDFs can be rejected by size before it is read
+                    session = pool.get()
+                    response = await session.send(session.build_request('GET', url), stream=True)
+                    if response.status_code not in RETRY_STATUSES:
+                        pool.mark_good(session)
+                        break
+                    pool.mark_bad(session)
+                    await response.aclose()
+                    if attempt == self.max_retries:
+                        break
+                    
+                    # Back off 0.5s, 1s, 2s... unless the server says how long to wait. The host slot is
+                    # held while waiting, so a long Retry-After gives up on the URL instead
+                    retry_after = response.headers.get('retry-after', '')
+                    if retry_after.isdigit() and int(retry_after) > self.max_retry_after:
+                        print(f"Giving up on {url}: server asked to retry after {retry_after}s")
+                        break
+                    delay = int(retry_after) if retry_after.isdigit() else self.retry_backoff * 2 ** attempt
+                    await asyncio.sleep(delay)
+                
+                try:
+                    response.raise_for_status()
+                    
+                    # Return raw bytes - decoding is left to the few pages that need their text.
+                    # PDFs served directly get the same size cap as linked ones
+                    content_type = response.headers.get('content-type', '')
+                    if 'pdf' in content_type.lower():
+                        body = await self.read_pdf_body(response, url)
+                    else:
+                        body = await response.aread()
+                finally:
+                    await response.aclose()
+            return body, content_type, response.charset_encoding
+        except httpx.HTTPError as e:
             print(f"Error fetching {url}: {e}")
-            return None, None
+            return None, None, None
         except Exception as e:
             print(f"Unexpected error fetching {url}: {e}")
-            return None, None
+            return None, None, None
 
-    def safe_parse_html(self, html_content):
-        """Parse HTML with multiple parser fallbacks"""
-        parsers = ['html.parser', 'lxml', 'html5lib']
-        
-        for parser in parsers:
-            try:
-                return BeautifulSoup(html_content, parser)
-            except Exception as e:
-                print(f"Parser {parser} failed, trying next...")
-                continue
+    async def read_pdf_body(self, response, url):
+        """Read a streamed PDF response, returning None if it is over the size limit"""
+        max_bytes = self.max_pdf_size_mb * 1024 * 1024
         
-        # If all parsers fail, try with error handling
-        try:
-            # Remove problematic characters and try again
-            cleaned_html = re.sub(r'[^\x00-\x7F]+', ' ', html_content)
-            return BeautifulSoup(cleaned_html, 'html.parser')
-        except Exception as e:
-            print(f"All parsers failed: {e}")
+        # Check declared size first to avoid huge downloads
+        content_length = response.headers.get('content-length')
+        if content_length and int(content_length) > max_bytes:
+            size_mb = int(content_length) / (1024 * 1024)
+            print(f"Skipping large PDF ({size_mb:.1f}MB): {url}")
             return None
+        
+        # Stream the body in chunks, giving up if it grows past the size limit
+        pdf_file = io.BytesIO()
+        async for chunk in response.aiter_bytes(chunk_size=64 * 1024):
+            pdf_file.write(chunk)
+            if pdf_file.tell() > max_bytes:
+                print(f"Skipping large PDF (over {self.max_pdf_size_mb}MB): {url}")
+                return None
+        return pdf_file.getvalue()
 
-    def extract_links(self, html, base_url):
-        """Extract all links from HTML content with better error handling"""
-        try:
-            soup = self.safe_parse_html(html)
-            if not soup:
-                return set()
-            
-            links = set()
-            
-            # Find all links
-            for tag in soup.find_all(['a', 'link'], href=True):
-                try:
-                    href = tag['href']
-                    full_url = urljoin(base_url, href)
-                    
-                    # Clean up the URL (remove fragments)
-                    parsed = urlparse(full_url)
-                    clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                    if parsed.query:
-                        clean_url += f"?{parsed.query}"
-                    
-                    links.add(clean_url)
-                except Exception as e:
-                    continue  # Skip problematic links
-            
-            return links
-        except Exception as e:
-            print(f"Error extracting links: {e}")
-            return set()
+    async def scan_pdf_content(self, pdf_bytes):
+        """Check downloaded PDF bytes for the target address in a worker process"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, scan_pdf, pdf_bytes,
+                                          self.address_pattern, self.quick_check)
 
-    def check_address_in_text(self, text):
-        """Check if any of the target address patterns are mentioned in text"""
+    async def check_pdf_content(self, pool, url):
+        """Stream a PDF and check it for the target address"""
+        host = urlparse(url).netloc
         try:
-            if not text:
-                return False, None
-            
-            # Quick pre-check: if '835' isn't in the text, skip expensive regex
-            if self.quick_check not in text:
+            async with self.host_semaphores[host]:
+                await self.rate_limiters[host].acquire()
+                session = pool.get()
+                async with session.stream('GET', url, timeout=15) as response:
+                    if response.status_code in RETRY_STATUSES:
+                        pool.mark_bad(session)
+                    else:
+                        pool.mark_good(session)
+                    response.raise_for_status()
+                    pdf_bytes = await self.read_pdf_body(response, url)
+            if pdf_bytes is None:
                 return False, None
             
-            # Check each pattern - return immediately on first match
-            for i, pattern in enumerate(self.compiled_patterns):
-                match = pattern.search(text)
-                if match:
-                    return True, match.group()
-            
-            return False, None
-        except Exception:
-            return False, None
-
-    def check_pdf_content(self, url):
-        """Download and check PDF content for the target address"""
-        try:
-            # Check file size first to avoid huge downloads
-            response = self.session.head(url, timeout=5)
-            if response.headers.get('content-length'):
-                size_mb = int(response.headers['content-length']) / (1024 * 1024)
-                if size_mb > 50:  # Skip PDFs larger than 50MB
-                    print(f"Skipping large PDF ({size_mb:.1f}MB): {url}")
-                    return False, None
-            
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            # Read PDF content
-            pdf_file = io.BytesIO(response.content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            
-            # Check each page and return immediately on first match
-            for page_num, page in enumerate(pdf_reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    
-                    # Quick pre-check before expensive regex
-                    if self.quick_check in page_text:
-                        found, matched_text = self.check_address_in_text(page_text)
-                        if found:
-                            return True, matched_text  # Stop as soon as we find a match
-                except Exception:
-                    continue  # Skip pages that can't be read
-            
-            return False, None  # No matches found in any page
+            # Read PDF content in a worker process so the event loop keeps fetching
+            return await self.scan_pdf_content(pdf_bytes)
             
         except Exception as e:
             print(f"Error reading PDF {url}: {e}")
@@ -232,7 +473,7 @@ class SLUSDCrawler:
 
     def record_finding(self, url, content_type, matched_text, title="", notes="", parent_page=""):
         """Record a finding and immediately save to CSV"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
         
         result = {
             'URL': url,
@@ -258,97 +499,135 @@ class SLUSDCrawler:
         else:
             print(f"✓ Found '{matched_text}' in {content_type}: {url}")
 
-    def crawl_site(self, max_pages=5000):
-        """Main crawling function with improved error handling"""
-        print(f"Starting crawl of {self.base_url}")
-        print(f"Looking for pages and PDFs containing address patterns:")
-        for i, pattern in enumerate(self.address_patterns, 1):
-            print(f"  {i}. {pattern}")
-        print(f"Results will be saved continuously to: {self.output_file}")
+    async def check_linked_pdf(self, pool, link, parent_page):
+        """Check a PDF linked from a page and record it if it mentions the address"""
+        found, matched_text = await self.check_pdf_content(pool, link)
+        if found:
+            self.record_finding(link, 'PDF', matched_text, 
+                              notes='PDF document (linked)', 
+                              parent_page=parent_page)
+
+    async def process_page(self, pool, queue, current_url):
+        """Fetch and scan a single page, queueing the links it contains"""
+        # Get page content
+        html_bytes, content_type, encoding = await self.get_page_content(pool, current_url)
+        if not html_bytes:
+            return
         
-        # Queue for URLs to visit
-        url_queue = deque([self.base_url])
-        pages_crawled = 0
+        # Check if this is a PDF accessed directly - its body was already downloaded (within the size cap)
+        if content_type and 'pdf' in content_type.lower():
+            found, matched_text = await self.scan_pdf_content(html_bytes)
+            if found:
+                self.record_finding(current_url, 'PDF', matched_text, notes='PDF document (direct access)')
+            return
         
-        while url_queue and pages_crawled < max_pages:
-            current_url = url_queue.popleft()
-            
-            if current_url in self.visited_urls:
+        # Parse HTML in a worker process with safe parsing
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.executor, scan_html, html_bytes, encoding, current_url,
+                                            self.address_pattern, self.quick_check)
+        if not result:
+            print(f"Could not parse HTML for {current_url}")
+            return
+        
+        # Check if page contains the target address
+        found, matched_text, title, links = result
+        if found:
+            self.record_finding(current_url, 'HTML Page', matched_text, title=title, notes='HTML page content')
+        
+        # Check linked PDFs concurrently and queue new pages
+        pdf_checks = []
+        for link in links:
+            if not self.is_valid_url(link) or self.should_skip_url(link):  # Skip asset files
                 continue
-                
-            self.visited_urls.add(current_url)
-            pages_crawled += 1
-            
-            print(f"Crawling ({pages_crawled}/{max_pages}): {current_url}")
-            
-            # Save progress every 50 pages
-            if pages_crawled % 50 == 0:
-                self.save_progress(pages_crawled, current_url)
-            
+            if link.lower().endswith('.pdf'):
+                pdf_checks.append(self.check_linked_pdf(pool, link, current_url))
+            elif not self.url_seen(link):
+                self.state_enqueue(link)
+                queue.put_nowait(link)
+        
+        await asyncio.gather(*pdf_checks)
+
+    async def worker(self, pool, queue, max_pages):
+        """Pull URLs off the shared queue until the crawl is cancelled"""
+        while True:
+            current_url = await queue.get()
             try:
-                # Get page content
-                html_content, content_type = self.get_page_content(current_url)
-                if not html_content:
-                    continue
-                
-                # Check if this is a PDF accessed directly
-                if content_type and 'pdf' in content_type.lower():
-                    found, matched_text = self.check_pdf_content(current_url)
-                    if found:
-                        self.record_finding(current_url, 'PDF', matched_text, notes='PDF document (direct access)')
-                    continue
-                
-                # Parse HTML content with safe parsing
-                soup = self.safe_parse_html(html_content)
-                if not soup:
-                    print(f"Could not parse HTML for {current_url}")
+                # URLs left over at max_pages stay in the persisted queue for the next run
+                if self.pages_crawled >= max_pages:
                     continue
                 
-                page_text = soup.get_text()
+                self.pages_crawled += 1
+                self.state_start(current_url)
+                print(f"Crawling ({self.pages_crawled}/{max_pages}): {current_url}")
                 
-                # Check if page contains any target address patterns
-                found, matched_text = self.check_address_in_text(page_text)
-                if found:
-                    title = soup.title.string if soup.title else 'No title'
-                    self.record_finding(current_url, 'HTML Page', matched_text, title=title, notes='HTML page content')
+                # Save progress every 50 pages
+                if self.pages_crawled % 50 == 0:
+                    self.save_progress(self.pages_crawled, current_url)
                 
-                # Extract and queue new links
-                links = self.extract_links(html_content, current_url)
-                for link in links:
-                    if (self.is_valid_url(link) and 
-                        not self.should_skip_url(link) and  # Skip asset files
-                        link not in self.visited_urls and 
-                        link not in url_queue):
-                        
-                        # Check if it's a PDF link
-                        if link.lower().endswith('.pdf'):
-                            found, matched_text = self.check_pdf_content(link)
-                            if found:
-                                self.record_finding(link, 'PDF', matched_text, 
-                                                  notes='PDF document (linked)', 
-                                                  parent_page=current_url)
-                        else:
-                            url_queue.append(link)
+                try:
+                    await self.process_page(pool, queue, current_url)
+                except Exception as e:
+                    print(f"Error processing {current_url}: {e}")
                 
-            except Exception as e:
-                print(f"Error processing {current_url}: {e}")
-                continue
-            
-            # Rate limiting - reduced for faster crawling
-            time.sleep(0.2)
+                # Only finished pages count as visited, so pages cut off by an interruption are retried
+                self.state_mark_visited(current_url)
+            finally:
+                queue.task_done()
+
+    async def crawl_site(self, max_pages=5000):
+        """Main crawling function with improved error handling"""
+        print(f"Starting crawl of {self.base_url}")
+        print(f"Looking for pages and PDFs containing address pattern:")
+        print(f"  {self.address_pattern}")
+        print(f"Results will be saved continuously to: {self.output_file}")
+        print(f"Fetching with {self.max_workers} workers ({self.per_host_limit} per host, "
+              f"{self.requests_per_second} requests/s per host)")
+        
+        # Queue for URLs to visit - an unfinished crawl picks up its saved queue
+        queue = asyncio.Queue()
+        for url in self.resume_queue or [self.base_url]:
+            queue.put_nowait(url)
+            self.state_enqueue(url)
+        self.pages_crawled = 0
+        self.host_semaphores = defaultdict(lambda: asyncio.Semaphore(self.per_host_limit))
+        self.rate_limiters = defaultdict(lambda: TokenBucket(self.requests_per_second, self.per_host_limit))
+        
+        pool = SessionPool(size=self.session_pool_size, proxies=self.proxies, retries=self.max_retries)
+        workers = []
+        try:
+            with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as self.executor:
+                try:
+                    workers = [asyncio.create_task(self.worker(pool, queue, max_pages))
+                               for _ in range(self.max_workers)]
+                    
+                    # Workers run until every queued URL has been handled
+                    await queue.join()
+                finally:
+                    # Stop the workers (also on Ctrl-C) before the sessions close under them, so a
+                    # page cut off mid-fetch is never marked visited
+                    for task in workers:
+                        task.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            await pool.aclose()
+            self.state.commit()
+        
+        # An empty queue means the site was fully crawled, so the next run starts fresh
+        if not self.state.execute('SELECT 1 FROM queue LIMIT 1').fetchone():
+            self.state.execute('DELETE FROM visited')
+            self.state.commit()
         
-        print(f"\nCrawl completed. Visited {pages_crawled} pages.")
-        self.save_progress(pages_crawled, "COMPLETED")
+        print(f"\nCrawl completed. Visited {self.pages_crawled} pages.")
+        self.save_progress(self.pages_crawled, "COMPLETED")
 
     def print_summary(self):
         """Print a summary of findings"""
         print(f"\n{'='*60}")
         print(f"CRAWL SUMMARY")
         print(f"{'='*60}")
-        print(f"Search patterns used:")
-        for i, pattern in enumerate(self.address_patterns, 1):
-            print(f"  {i}. {pattern}")
-        print(f"Total pages crawled: {len(self.visited_urls)}")
+        print(f"Search pattern used:")
+        print(f"  {self.address_pattern}")
+        print(f"Total pages crawled: {self.pages_crawled}")
         print(f"HTML pages with address: {len(self.found_pages)}")
         print(f"PDFs with address: {len(self.found_pdfs)}")
         print(f"Results saved to: {self.output_file}")
@@ -376,7 +655,7 @@ def main():
     
     try:
         # Start crawling
-        crawler.crawl_site(max_pages=20000)
+        asyncio.run(crawler.crawl_site(max_pages=20000))
         
         # Print summary
         crawler.print_summary()
@@ -392,12 +671,15 @@ def main():
 if __name__ == "__main__":
     # Install required packages if not already installed
     try:
-        import PyPDF2
-        import requests
+        import pypdf
+        import httpx
+        import h2
         from bs4 import BeautifulSoup
+        from selectolax.lexbor import LexborHTMLParser
+        import lxml
     except ImportError:
         print("Missing required packages. Install them with:")
-        print("pip install requests beautifulsoup4 PyPDF2")
+        print("pip install 'httpx[http2]' selectolax lxml beautifulsoup4 pypdf")
         exit(1)
     
     main()
\ No newline at end of file